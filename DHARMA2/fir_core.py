@@ -0,0 +1,295 @@
+"""FIR text extraction and legal mapping, kept free of Streamlit so it can be
+compiled ahead of time with mypyc (see setup.py)."""
+
+import re
+import orjson
+from typing import Dict, List, Any, Set, Tuple
+import os
+import string
+import threading
+
+try:
+    import re2  # type: ignore  # google-re2: linear-time matching, optional
+except ImportError:
+    re2 = None
+try:
+    import hyperscan  # type: ignore  # python-hyperscan: SIMD multi-literal scanning, optional
+except ImportError:
+    hyperscan = None
+
+# ----------------------------------------------------------
+# Compiled Regex Patterns
+# ----------------------------------------------------------
+def _compile(pattern: str) -> Any:
+    r"""Compile with RE2 when it is installed, else with the stdlib engine.
+
+    The engines differ on non-ASCII input: RE2's \w, \d and \b are
+    ASCII-only, so e.g. Telugu digits match \d only on re. Whitespace is not
+    affected because lower_aligned maps Unicode spaces to " " before matching.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+# Patterns with lookaround (complainant scan, keywords, witnesses) are not
+# supported by RE2 and stay on re; the rest go through _compile.
+# Case-insensitive patterns are written in lowercase and run against the
+# lowercased text instead of paying for IGNORECASE; captured spans are sliced
+# back out of the original text to keep its casing.
+# Complainant fields fused into one zero-width alternation: each field starts
+# with a distinct literal anchor, so a single finditer pass yields the leftmost
+# hit per field, same as running one re.search per field.
+_RE_COMPLAINANT = re.compile(
+    r"(?=complainant\s+(?P<Name>[a-z](?:[a-z]+|\s+[a-z]+)(?:\s+[a-z]+)*)"
+    r"|s/o\s+(?P<Father>[a-z](?:[a-z]+|\s+[a-z]+)(?:\s+[a-z]+)*)"
+    r"|aged\s+(?P<Age>\d{1,3})(?!\d)"
+    r"|(?P<Community>scheduled\s+caste|scheduled\s+tribe|backward\s+class)"
+    r"|occupation[:\s]*(?P<Occupation>[a-z]+(?:\s+[a-z]+)*)"
+    r"|resident\s+of\s+(?P<Address>[a-z]+(?:[\s,]+[a-z]+)*))")
+_COMPLAINANT_FIELDS = ("Name", "Father", "Age", "Community", "Occupation", "Address")
+# Accused are located by their "<name>, aged about N" anchor; relation and
+# address are then looked up in a bounded window after it, which keeps the
+# scan linear instead of backtracking through chained optional groups.
+# Captures start and end on a letter, so they need no strip() afterwards. A name
+# may open with a bare initial followed by a space ("A Ramesh"), but not with a
+# dotted one ("K. Ramesh"), which would otherwise capture just the letter.
+_RE_AGED = _compile(r"\b([a-z](?:[a-z]{1,19}|\s+[a-z]{1,20})(?:\s+[a-z]{1,20}){0,4})\s*,\s*aged\s*about\s*(\d{1,3})(?:\D|$)")
+_RE_SO = _compile(r"s/o\s+([a-z](?:[a-z]{1,19}|\s+[a-z]{1,20})(?:\s+[a-z]{1,20}){0,3})")
+_RE_RES = _compile(r"resident\s+of\s+([a-z]{1,30}(?:\s+[a-z]{1,30}){0,5})")
+_ACCUSED_WINDOW = 200
+_RE_UNKNOWN_DESC = _compile(r"unknown person.*?(medium build|black shirt|fair|dark)")
+_RE_VEHICLE = _compile(r"(AP-\d{2}-[A-Z]{2}-\d{4})")
+_RE_PROPERTY = _compile(r"samsung.*?₹\d+|\bcash\s*₹?\d+")
+_RE_WITNESS = re.compile(r"\b([A-Z][a-z]+)\b(?=,|\s+and)")
+_WITNESS_EXCLUDE = frozenset({"Rajesh", "Rao", "Babu", "Krishna"})
+_RE_DATE = _compile(r"\d{1,2}(?:th|st|nd|rd)?\s+\w+\s+\d{4}")
+_RE_TIME = _compile(r"\d{1,2}[:.]\d+\s*[ap]m")
+_RE_PLACE = _compile(r"near\s+((?:[a-z]+\s+)*culvert)")
+# Literal keywords matched in one pass over the lowercased text. The lookahead
+# reports overlapping hits too. The first group feeds the rule tables; the
+# second are anchors that must be present before a field regex is worth running.
+_KEYWORDS = ("pistol", "stick", "caste", "mala", "kill", "fire", "burn",
+             "snatched", "cash", "injury", "bleeding", "hospital", "unknown",
+             "aged", "ap-", "samsung", "culvert")
+_RE_KEYWORDS = re.compile("(?=(%s))" % "|".join(_KEYWORDS))
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+# Non-ASCII whitespace (NBSP from PDF/web pastes etc.), which RE2's \s misses.
+_UNICODE_SPACES = str.maketrans(dict.fromkeys(
+    "\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008"
+    "\u2009\u200a\u2028\u2029\u202f\u205f\u3000", " "))
+
+def _build_keyword_db() -> Any:
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[k.encode() for k in _KEYWORDS],
+        ids=list(range(len(_KEYWORDS))),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_KEYWORDS))
+    return db
+
+_KEYWORD_DB = _build_keyword_db()
+# Hyperscan scratch space must not be shared between concurrent scans, and
+# Streamlit runs each session on its own thread.
+_scan_local = threading.local()
+
+# ----------------------------------------------------------
+# Rule Tables
+# ----------------------------------------------------------
+# (keywords, label) rules: a label applies when any of its keywords was hit.
+_Rules = Tuple[Tuple[Tuple[str, ...], str], ...]
+_WEAPON_RULES: _Rules = (
+    (("pistol",), "Country-made pistol"),
+    (("stick",), "Stick"),
+)
+_OFFENCE_RULES: _Rules = (
+    (("caste", "mala"), "Caste abuse"),
+    (("pistol", "fire"), "Threat with firearm"),
+    (("snatched", "cash"), "Robbery"),
+    (("injury", "bleeding"), "Assault causing injury"),
+)
+_THREAT_RULES: _Rules = (
+    (("kill",), "Kill him"),
+    (("fire", "burn"), "Set fire to his hut"),
+)
+_LAWS = ("BNS 2023", "SC/ST Act 1989", "Arms Act 1959")
+# (offence, law, sections) rules, listed in output order within each law.
+_LEGAL_RULES = (
+    ("Robbery", "BNS 2023", ("Sec. 309 – Robbery",)),
+    ("Assault causing injury", "BNS 2023", ("Sec. 115 – Hurt",)),
+    ("Threat with firearm", "BNS 2023", ("Sec. 351 – Criminal intimidation",)),
+    ("Caste abuse", "SC/ST Act 1989", (
+        "Sec. 3(1)(r) – Intentional insult/abuse by caste name",
+        "Sec. 3(2)(v) – Offence committed on ground of caste",
+    )),
+    ("Threat with firearm", "Arms Act 1959", (
+        "Sec. 25 – Possession/use of illegal arms",
+        "Sec. 27 – Use of firearm in commission of offence",
+    )),
+)
+
+# ----------------------------------------------------------
+# Extraction
+# ----------------------------------------------------------
+def lower_aligned(text: str) -> str:
+    """Lowercase text while keeping every character at the same offset."""
+    lowered = text.lower()
+    # A few characters (e.g. "İ") lowercase to two; fall back to ASCII-only
+    # folding so match offsets still index into the original text.
+    if len(lowered) != len(text): lowered = text.translate(_ASCII_LOWER)
+    # Unicode spaces become " " so \s matches them on either regex engine.
+    return lowered if lowered.isascii() else lowered.translate(_UNICODE_SPACES)
+
+def extract_complainant_info(text: str, text_lower: str) -> Dict[str, Any]:
+    found: Dict[str, str] = {}
+    for m in _RE_COMPLAINANT.finditer(text_lower):
+        field = m.lastgroup
+        if field is not None and field not in found:
+            found[field] = text[m.start(field):m.end(field)]
+            if len(found) == len(_COMPLAINANT_FIELDS): break
+    info: Dict[str, Any] = {k: found[k] for k in _COMPLAINANT_FIELDS if k in found}
+    if "Age" in info: info["Age"] = int(info["Age"])
+    return info
+
+def _on_keyword(kw_id: int, start: int, end: int, flags: int, hits: Set[str]) -> None:
+    hits.add(_KEYWORDS[kw_id])
+
+def keyword_hits(text_lower: str) -> Set[str]:
+    if _KEYWORD_DB is None:
+        return set(_RE_KEYWORDS.findall(text_lower))
+    scratch = getattr(_scan_local, "scratch", None)
+    if scratch is None:
+        scratch = _scan_local.scratch = hyperscan.Scratch(_KEYWORD_DB)
+    hits: Set[str] = set()
+    _KEYWORD_DB.scan(text_lower.encode("utf-8"), match_event_handler=_on_keyword,
+                     context=hits, scratch=scratch)
+    return hits
+
+def extract_accused_info(text: str, text_lower: str, hits: Set[str]) -> List[Dict[str, Any]]:
+    anchors = list(_RE_AGED.finditer(text_lower)) if "aged" in hits else []
+    accused_list = []
+    for i, m in enumerate(anchors):
+        end = m.end() + _ACCUSED_WINDOW
+        if i + 1 < len(anchors): end = min(end, anchors[i + 1].start())
+        acc = {"Name": text[m.start(1):m.end(1)], "Age": int(m.group(2))}
+        relation = _RE_SO.search(text_lower, m.end(), end)
+        addr = _RE_RES.search(text_lower, m.end(), end)
+        if relation: acc["Relation"] = f"S/o {text[relation.start(1):relation.end(1)]}"
+        if addr: acc["Address"] = text[addr.start(1):addr.end(1)]
+        accused_list.append(acc)
+    if "unknown" in hits:
+        unknown_match = _RE_UNKNOWN_DESC.search(text_lower)
+        desc = text[unknown_match.start(1):unknown_match.end(1)] if unknown_match else "Unknown description"
+        accused_list.append({"Name": "Unknown", "Description": desc})
+    return accused_list
+
+def extract_vehicles(text: str, hits: Set[str]) -> List[str]:
+    return _RE_VEHICLE.findall(text) if "ap-" in hits else []
+
+def _apply_rules(rules: _Rules, hits: Set[str]) -> List[str]:
+    return [label for kws, label in rules if not hits.isdisjoint(kws)]
+
+def extract_weapons(hits: Set[str]) -> List[str]:
+    return _apply_rules(_WEAPON_RULES, hits)
+
+def extract_offences(hits: Set[str]) -> List[str]:
+    return _apply_rules(_OFFENCE_RULES, hits)
+
+def extract_property_loss(text: str, text_lower: str, hits: Set[str]) -> List[str]:
+    if "samsung" not in hits and "cash" not in hits: return []
+    return [text[m.start():m.end()] for m in _RE_PROPERTY.finditer(text_lower)]
+
+def extract_threats(hits: Set[str]) -> List[str]:
+    return _apply_rules(_THREAT_RULES, hits)
+
+def extract_witnesses(text: str) -> List[str]:
+    return [x for x in _RE_WITNESS.findall(text) if x not in _WITNESS_EXCLUDE]
+
+def extract_datetime(text: str, text_lower: str) -> str:
+    # First date with a time after it on the same line. Once a line has no
+    # time after some date, later dates on that line cannot have one either.
+    failed_eol = -1
+    for d in _RE_DATE.finditer(text_lower):
+        if d.end() < failed_eol: continue
+        eol = text_lower.find("\n", d.end())
+        if eol == -1: eol = len(text_lower)
+        t = _RE_TIME.search(text_lower, d.end(), eol)
+        if t: return f"{text[d.start():d.end()]}, {text[t.start():t.end()]}"
+        failed_eol = eol
+    return ""
+
+def extract_place(text: str, text_lower: str, hits: Set[str]) -> str:
+    m = _RE_PLACE.search(text_lower) if "culvert" in hits else None
+    return text[m.start(1):m.end(1)] if m else "Not mentioned"
+
+def map_legal_sections(info: Dict[str, Any]) -> Dict[str, List[str]]:
+    mapping: Dict[str, List[str]] = {law: [] for law in _LAWS}
+    offences = set(info.get("Offences", []))
+    for offence, law, sections in _LEGAL_RULES:
+        if offence in offences: mapping[law].extend(sections)
+    return {k: v for k, v in mapping.items() if v}
+
+# Input shorter than this (e.g. a partial paste) is not scanned at all and
+# yields empty_result(), even if it mentions keywords such as "kill" or "cash".
+_MIN_FIR_LENGTH = 40
+
+def empty_result() -> Dict[str, Any]:
+    return {
+        "Complainant": {},
+        "DateTime": "",
+        "Place": "Not mentioned",
+        "Accused": [],
+        "Vehicles": [],
+        "WeaponsUsed": [],
+        "Offences": [],
+        "PropertyLoss": [],
+        "Threats": [],
+        "Witnesses": [],
+        "Impact": "",
+        "LegalMapping": {},
+    }
+
+def extract_all(text: str) -> Dict[str, Any]:
+    if len(text) < _MIN_FIR_LENGTH:
+        return empty_result()
+    text_lower = lower_aligned(text)
+    hits = keyword_hits(text_lower)
+    data = {
+        "Complainant": extract_complainant_info(text, text_lower),
+        "DateTime": extract_datetime(text, text_lower),
+        "Place": extract_place(text, text_lower, hits),
+        "Accused": extract_accused_info(text, text_lower, hits),
+        "Vehicles": extract_vehicles(text, hits),
+        "WeaponsUsed": extract_weapons(hits),
+        "Offences": extract_offences(hits),
+        "PropertyLoss": extract_property_loss(text, text_lower, hits),
+        "Threats": extract_threats(hits),
+        "Witnesses": extract_witnesses(text),
+        "Impact": "Fear, public fled, complainant hospitalized" if "hospital" in hits else ""
+    }
+    data["LegalMapping"] = map_legal_sections(data)
+    return data
+
+# ----------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------
+def save_extracted_data(data: Dict[str, Any], filename: str = "extracted_fir_data.jsonl") -> None:
+    with open(filename, "ab") as f:
+        f.write(orjson.dumps(data) + b"\n")
+
+def jsonl_to_json(src: str = "extracted_fir_data.jsonl", dst: str = "extracted_fir_export.json",
+                  legacy: str = "extracted_fir_data.json") -> None:
+    """Export every saved record as a single JSON array: the records in the
+    pre-JSONL `legacy` array first, then the appended JSON-lines log."""
+    all_data: List[Any] = []
+    if os.path.exists(legacy):
+        with open(legacy, "rb") as f:
+            all_data.extend(orjson.loads(f.read()))
+    if os.path.exists(src):
+        with open(src, "rb") as f:
+            all_data.extend(orjson.loads(line) for line in f if line.strip())
+    with open(dst, "wb") as f:
+        f.write(orjson.dumps(all_data, option=orjson.OPT_INDENT_2))
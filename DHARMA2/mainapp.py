@@ -1,8 +1,9 @@
-import re
-import json
+import orjson
 import streamlit as st
-from typing import Dict, List, Any
-import os
+from functools import partial
+from typing import Dict, Any
+
+from fir_core import extract_all, save_extracted_data
 
 # ----------------------------------------------------------
 # Page Config
@@ -27,125 +28,20 @@ if "result" not in st.session_state:
 # ----------------------------------------------------------
 # Helper Functions
 # ----------------------------------------------------------
-def extract_complainant_info(text: str) -> Dict[str, Any]:
-    info = {}
-    name_match = re.search(r"complainant\s+([A-Z][a-zA-Z\s]+)", text, re.I)
-    father_match = re.search(r"S/o\s+([A-Z][a-zA-Z\s]+)", text, re.I)
-    age_match = re.search(r"aged\s+(\d+)", text, re.I)
-    caste_match = re.search(r"(Scheduled\s+Caste|Scheduled\s+Tribe|Backward\s+Class)", text, re.I)
-    occ_match = re.search(r"occupation[:\s]*([A-Za-z\s]+)", text, re.I)
-    addr_match = re.search(r"resident\s+of\s+([A-Za-z\s,]+)", text, re.I)
-    if name_match: info["Name"] = name_match.group(1).strip()
-    if father_match: info["Father"] = father_match.group(1).strip()
-    if age_match: info["Age"] = int(age_match.group(1))
-    if caste_match: info["Community"] = caste_match.group(1).strip()
-    if occ_match: info["Occupation"] = occ_match.group(1).strip()
-    if addr_match: info["Address"] = addr_match.group(1).strip()
-    return info
-
-def extract_accused_info(text: str) -> List[Dict[str, Any]]:
-    accused_block = re.findall(
-        r"([A-Z][a-zA-Z\s]+),\s*aged\s*about\s*(\d+).*?(?:S/o\s*([A-Za-z\s]+))?.*?(?:resident\s*of\s*([A-Za-z\s]+))?.*?(?:history-sheeter)?",
-        text, re.I)
-    accused_list = []
-    for match in accused_block:
-        name, age, relation, addr = match
-        acc = {"Name": name.strip(), "Age": int(age)}
-        if relation: acc["Relation"] = f"S/o {relation.strip()}"
-        if addr: acc["Address"] = addr.strip()
-        accused_list.append(acc)
-    if "unknown" in text.lower():
-        unknown_match = re.search(r"unknown person.*?(medium build|black shirt|fair|dark)", text, re.I)
-        desc = unknown_match.group(1) if unknown_match else "Unknown description"
-        accused_list.append({"Name": "Unknown", "Description": desc})
-    return accused_list
-
-def extract_vehicles(text: str) -> List[str]:
-    return re.findall(r"(AP-\d{2}-[A-Z]{2}-\d{4})", text)
-
-def extract_weapons(text: str) -> List[str]:
-    weapons = []
-    if "pistol" in text.lower(): weapons.append("Country-made pistol")
-    if "stick" in text.lower(): weapons.append("Stick")
-    return weapons
-
-def extract_offences(text: str) -> List[str]:
-    offences = []
-    if "caste" in text.lower() or "mala" in text.lower(): offences.append("Caste abuse")
-    if "pistol" in text.lower() or "fire" in text.lower(): offences.append("Threat with firearm")
-    if "snatched" in text.lower() or "cash" in text.lower(): offences.append("Robbery")
-    if "injury" in text.lower() or "bleeding" in text.lower(): offences.append("Assault causing injury")
-    return offences
-
-def extract_property_loss(text: str) -> List[str]:
-    return re.findall(r"(Samsung.*?₹\d+|\bcash\s*₹?\d+)", text, re.I)
-
-def extract_threats(text: str) -> List[str]:
-    threats = []
-    if "kill" in text.lower(): threats.append("Kill him")
-    if "fire" in text.lower() or "burn" in text.lower(): threats.append("Set fire to his hut")
-    return threats
-
-def extract_witnesses(text: str) -> List[str]:
-    w = re.findall(r"\b([A-Z][a-z]+)\b(?=,|\s+and)", text)
-    return [x for x in w if x not in ["Rajesh", "Rao", "Babu", "Krishna"]]
-
-def extract_datetime(text: str) -> str:
-    m = re.search(r"(\d{1,2}(?:th|st|nd|rd)?\s+\w+\s+\d{4}).*?(\d{1,2}[:.]\d+\s*[AP]M)", text, re.I)
-    return f"{m.group(1)}, {m.group(2)}" if m else ""
-
-def extract_place(text: str) -> str:
-    m = re.search(r"near\s+([A-Za-z\s]+culvert)", text, re.I)
-    return m.group(1).strip() if m else "Not mentioned"
-
-def map_legal_sections(info: Dict[str, Any]) -> Dict[str, List[str]]:
-    mapping = {"BNS 2023": [], "SC/ST Act 1989": [], "Arms Act 1959": []}
-    offences = info.get("Offences", [])
-    if "Robbery" in offences: mapping["BNS 2023"].append("Sec. 309 – Robbery")
-    if "Assault causing injury" in offences: mapping["BNS 2023"].append("Sec. 115 – Hurt")
-    if any("Threat" in x for x in offences): mapping["BNS 2023"].append("Sec. 351 – Criminal intimidation")
-    if "Caste abuse" in offences:
-        mapping["SC/ST Act 1989"].extend([
-            "Sec. 3(1)(r) – Intentional insult/abuse by caste name",
-            "Sec. 3(2)(v) – Offence committed on ground of caste"
-        ])
-    if "firearm" in " ".join(offences) or "pistol" in " ".join(offences):
-        mapping["Arms Act 1959"].extend([
-            "Sec. 25 – Possession/use of illegal arms",
-            "Sec. 27 – Use of firearm in commission of offence"
-        ])
-    return {k: v for k, v in mapping.items() if v}
-
-def extract_all(text: str) -> Dict[str, Any]:
-    data = {
-        "Complainant": extract_complainant_info(text),
-        "DateTime": extract_datetime(text),
-        "Place": extract_place(text),
-        "Accused": extract_accused_info(text),
-        "Vehicles": extract_vehicles(text),
-        "WeaponsUsed": extract_weapons(text),
-        "Offences": extract_offences(text),
-        "PropertyLoss": extract_property_loss(text),
-        "Threats": extract_threats(text),
-        "Witnesses": extract_witnesses(text),
-        "Impact": "Fear, public fled, complainant hospitalized" if "hospital" in text.lower() else ""
-    }
-    data["LegalMapping"] = map_legal_sections(data)
-    return data
-
-def save_extracted_data(data: Dict[str, Any], filename="extracted_fir_data.json"):
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-    else:
-        all_data = []
-    all_data.append(data)
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, indent=2, ensure_ascii=False)
+@st.cache_data(max_entries=512, show_spinner=False)
+def extract_all_cached(text: str) -> Dict[str, Any]:
+    return extract_all(text)
 
 # ----------------------------------------------------------
 # Streamlit UI
 # ----------------------------------------------------------
+def reset_extraction():
+    # Runs as a button callback, i.e. before the rerun the click triggers,
+    # so the cleared state is rendered without a second st.rerun().
+    st.session_state.fir_text = ""
+    st.session_state.result = None
+    st.session_state.pop("fir_text_area", None)
+
 st.subheader("📄 Input FIR Text")
 option = st.radio("Choose Input Method:", ["✍️ Paste FIR Text", "📁 Upload .txt File"])
 
@@ -161,16 +57,14 @@ with col1:
         if not fir_text.strip():
             st.warning("Please enter or upload FIR text.")
         else:
-            result = extract_all(fir_text)
+            result = extract_all_cached(fir_text)
             st.session_state.result = result
             st.session_state.fir_text = fir_text
             st.success("✅ Extraction Completed!")
             save_extracted_data(result)
 
 with col2:
-    if st.button("🔁 New Extraction"):
-        st.session_state.clear()
-        st.rerun()
+    st.button("🔁 New Extraction", on_click=reset_extraction)
 
 # ----------------------------------------------------------
 # Display Output
@@ -211,7 +105,7 @@ if st.session_state.get("result"):
 
     st.download_button(
         label="⬇️ Download Extracted JSON",
-        data=json.dumps(result, indent=2, ensure_ascii=False),
+        data=partial(orjson.dumps, result, option=orjson.OPT_INDENT_2),
         file_name="fir_extracted_data.json",
         mime="application/json"
     )
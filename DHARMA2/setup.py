@@ -0,0 +1,16 @@
+"""Optional ahead-of-time build of fir_core with mypyc.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+mainapp.py imports fir_core as usual and picks up the compiled extension when
+it is present next to it; the pure-Python module is used otherwise.
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="dharma-fir-core",
+    py_modules=["fir_core"],
+    ext_modules=mypycify(["fir_core.py"]),
+)